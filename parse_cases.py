@@ -1,16 +1,20 @@
 from __future__ import annotations
 
 import argparse
-import json
 import re
 import sys
-from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Iterable, Iterator, List, Mapping, Optional, Tuple
+from typing import List, Mapping, NamedTuple, Optional, Sequence, Tuple
 from urllib.parse import urljoin, urlparse
 
+import lxml.html
+import orjson
 import requests
-from bs4 import BeautifulSoup, Tag
+from lxml import etree
+from lxml.html import HtmlElement
+from requests.adapters import HTTPAdapter
 
 
 DEFAULT_BASE_URL = "https://ads.vk.com"
@@ -26,6 +30,10 @@ DEFAULT_HEADERS: Mapping[str, str] = {
     )
 }
 
+# Общая сессия с keep-alive: повторные запросы переиспользуют TCP/TLS-соединения.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
 
 def derive_base_url(url: Optional[str]) -> Optional[str]:
     """Возвращает базовый URL (схема + хост) из произвольной ссылки."""
@@ -47,7 +55,7 @@ def fetch_html_from_url(
     request_headers: dict[str, str] = dict(DEFAULT_HEADERS)
     if headers:
         request_headers.update(headers)
-    response = requests.get(url, timeout=timeout, headers=request_headers)
+    response = _SESSION.get(url, timeout=timeout, headers=request_headers)
     response.raise_for_status()
     response.encoding = response.encoding or response.apparent_encoding
     return response.text
@@ -92,6 +100,7 @@ MONTH_ALIASES = {
 }
 
 
+@lru_cache(maxsize=256)
 def _normalize_month_token(value: str) -> str:
     """Возвращает нормализованную форму русского названия месяца."""
     return value.strip().lower().replace("ё", "е").rstrip(".")
@@ -106,17 +115,94 @@ def _build_month_mapping() -> dict[str, int]:
     return mapping
 
 
+def _build_month_pattern() -> str:
+    """Собирает альтернативу всех названий месяцев (длинные формы раньше коротких)."""
+    tokens = sorted(_build_month_mapping(), key=len, reverse=True)
+    return "|".join(re.escape(token).replace("е", "[её]") for token in tokens)
+
+
 # Быстрый доступ к номеру месяца по строковому ключу.
 MONTHS_RU = _build_month_mapping()
 
-# Регулярные выражения, покрывающие ISO, dd.mm.yyyy и русские текстовые даты.
-ISO_DATE_RE = re.compile(r"^(?P<year>\d{4})-(?P<month>\d{2})-(?P<day>\d{2})")
-DOT_DATE_RE = re.compile(r"^(?P<day>\d{1,2})[./](?P<month>\d{1,2})[./](?P<year>\d{4})")
-RUSSIAN_TEXT_DATE_RE = re.compile(
-    r"(?P<day>\d{1,2})\s+(?P<month>[А-Яа-яёЁ.\-]+)\s+(?P<year>\d{4})(?:\s*(?:г(?:\.|ода)?))?",
+# Единое регулярное выражение для ISO, dd.mm.yyyy и русских текстовых дат:
+# по сработавшей группе понятно, какой формат встретился. Названия месяцев
+# распознаются прямо в выражении, без отдельного разбора токена.
+DATE_RE = re.compile(
+    r"^(?P<iso_year>\d{4})-(?P<iso_month>\d{2})-(?P<iso_day>\d{2})"
+    r"|^(?P<dot_day>\d{1,2})[./](?P<dot_month>\d{1,2})[./](?P<dot_year>\d{4})"
+    rf"|(?P<text_day>\d{{1,2}})\s+(?P<text_month>{_build_month_pattern()})\.*\s+(?P<text_year>\d{{4}})"
+    r"(?:\s*(?:г(?:\.|ода)?))?",
     flags=re.IGNORECASE,
 )
 
+# Разметка передаётся в lxml байтами в UTF-8: так парсер не спотыкается
+# об XML-декларацию с кодировкой в начале страницы. Комментарии и processing
+# instructions не попадают в дерево, а таблица id не строится — она не нужна.
+_HTML_PARSER = lxml.html.HTMLParser(
+    encoding="utf-8",
+    remove_comments=True,
+    remove_pis=True,
+    collect_ids=False,
+)
+# Поддеревья, которые никогда не содержат карточек, заголовков или дат.
+_SKIPPED_TAGS = ("script", "style")
+
+# XPath-предикаты карточек и заголовков в порядке приоритета. Объединение
+# компилируется один раз и обходит дерево за один проход в C, а по отдельным
+# предикатам (через ось self::) выбирается сработавший вариант.
+CASE_CARD_PREDICATES = (
+    '*[@data-testid="case-card"]',
+    '*[contains(concat(" ", normalize-space(@class), " "), " CaseCard ")]',
+    'a[contains(@href, "/cases/")]',
+)
+TITLE_PREDICATES = (
+    '*[@data-testid="case-card-title"]',
+    '*[@itemprop="headline"]',
+    '*[@itemprop="name"]',
+    '*[contains(@class, "case-card_title")]',
+    '*[contains(@class, "CaseCard__title")]',
+    '*[contains(concat(" ", normalize-space(@class), " "), " CaseCard__title ")]',
+    '*[contains(concat(" ", normalize-space(@class), " "), " vkuiHeadline ")]',
+    "h1",
+    "h3",
+    "h2",
+)
+
+
+def _xpath_lower(expression: str) -> str:
+    """Оборачивает XPath-выражение в translate(): в XPath 1.0 нет lower-case()."""
+    return f'translate({expression}, "ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")'
+
+
+# Регистронезависимый поиск "date" в class и data-testid.
+_DATE_ATTR_PREDICATE = (
+    f'*[contains({_xpath_lower("@class")}, "date")'
+    f' or contains({_xpath_lower("@data-testid")}, "date")]'
+)
+# Запасной поиск заголовка: h1-h4 или "title"/"headline" в class/data-testid,
+# кроме кнопок и всего, что лежит внутри них.
+_TITLE_FALLBACK_PREDICATE = (
+    "*[(self::h1 or self::h2 or self::h3 or self::h4"
+    f' or contains({_xpath_lower("@class")}, "title")'
+    f' or contains({_xpath_lower("@class")}, "headline")'
+    f' or contains({_xpath_lower("@data-testid")}, "title"))'
+    " and not(self::button or ancestor::button)"
+    f' and not({_xpath_lower("@role")} = "button")]'
+)
+
+_CARDS_XP = etree.XPath(" | ".join(f"//{predicate}" for predicate in CASE_CARD_PREDICATES))
+_CARD_MATCHERS = tuple(etree.XPath(f"self::{predicate}") for predicate in CASE_CARD_PREDICATES)
+_TITLE_XP = etree.XPath(" | ".join(f".//{predicate}" for predicate in TITLE_PREDICATES))
+_TITLE_MATCHERS = tuple(etree.XPath(f"self::{predicate}") for predicate in TITLE_PREDICATES)
+# Отдельные запросы по каждому варианту — для специализированного пути,
+# когда схема карточек сайта уже известна (см. extract_cases(reuse_schema=True)).
+_CARD_BRANCH_XPS = tuple(etree.XPath(f"//{predicate}") for predicate in CASE_CARD_PREDICATES)
+_TITLE_BRANCH_XPS = tuple(etree.XPath(f"(.//{predicate})[1]") for predicate in TITLE_PREDICATES)
+_TITLE_FALLBACK_XP = etree.XPath(f".//{_TITLE_FALLBACK_PREDICATE}")
+_DATE_ATTR_XP = etree.XPath(f".//{_DATE_ATTR_PREDICATE}")
+# Текстовые узлы элемента (<script>/<style> вырезаются ещё при разборе).
+_TEXT_XP = etree.XPath(".//text()")
+
 # Подборка шаблонных заголовков, которые нужно игнорировать.
 GENERIC_TITLE_STRINGS = {
     "подробнее",
@@ -127,32 +213,24 @@ GENERIC_TITLE_STRINGS = {
 }
 
 
-def _iter_strings(value: object | None) -> Iterator[str]:
-    """Выдаёт по очереди строковые значения из атрибутов BeautifulSoup."""
-
-    if isinstance(value, str):
-        yield value
-    elif isinstance(value, (list, tuple)):
-        for item in value:
-            if isinstance(item, str):
-                yield item
-
-
-def _first_string(value: object | None) -> Optional[str]:
-    """Возвращает первую строку из атрибута тега (если она есть)."""
-    for item in _iter_strings(value):
-        return item
-    return None
+# Таблица замен для _clean_text: один проход str.translate вместо цепочки replace.
+_CLEAN_TEXT_TABLE = str.maketrans(
+    {
+        "\u00a0": " ",  # неразрывный пробел
+        "\u2007": " ",  # цифровой пробел
+        "\u2008": " ",  # пунктуационный пробел
+        "\u2009": " ",  # тонкий пробел
+        "\u200a": " ",  # волосяная шпация
+        "\u202f": " ",  # узкий неразрывный пробел
+        "\u3000": " ",  # идеографический пробел
+        "\xad": None,  # мягкий перенос
+    }
+)
 
 
 def _clean_text(value: str) -> str:
     """Убирает неразрывные ошибки пробелов и мягкие переносы, нормализуя текст."""
-    return (
-        value.replace("\u00a0", " ")  # неразрывный пробел
-        .replace("\u2009", " ")  # тонкий пробел
-        .replace("\xad", "")  # мягкий перенос
-        .strip()
-    )
+    return value.translate(_CLEAN_TEXT_TABLE).strip()
 
 
 def _normalize_title_text(value: Optional[str]) -> Optional[str]:
@@ -167,6 +245,21 @@ def _normalize_title_text(value: Optional[str]) -> Optional[str]:
     return text
 
 
+# Число дней в месяцах невисокосного года; февраль високосного года — отдельно.
+_DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+def _is_valid_date(year: int, month: int, day: int) -> bool:
+    """Проверяет, что такой день существует (диапазон годов как у datetime)."""
+    if not 1 <= year <= 9999 or not 1 <= month <= 12 or day < 1:
+        return False
+    if month == 2 and year % 4 == 0 and (year % 100 != 0 or year % 400 == 0):
+        return day <= 29
+    return day <= _DAYS_IN_MONTH[month - 1]
+
+
+# Одни и те же строки дат повторяются в карточках, поэтому результат кэшируется.
+@lru_cache(maxsize=1024)
 def normalize_date(raw: Optional[str]) -> Optional[str]:
     """Преобразует известные форматы дат в строку вида YYYY-MM-DD."""
 
@@ -177,146 +270,209 @@ def normalize_date(raw: Optional[str]) -> Optional[str]:
     if not value:
         return None
 
-    match = ISO_DATE_RE.search(value)
-    if match:
-        return "{year}-{month}-{day}".format(**match.groupdict())
-
-    match = DOT_DATE_RE.search(value)
-    if match:
-        day = int(match.group("day"))
-        month = int(match.group("month"))
-        year = int(match.group("year"))
-        try:
-            return datetime(year, month, day).strftime("%Y-%m-%d")
-        except ValueError:
+    match = DATE_RE.search(value)
+    if not match:
+        return None
+
+    if match.group("iso_year"):
+        return f"{match.group('iso_year')}-{match.group('iso_month')}-{match.group('iso_day')}"
+
+    if match.group("dot_year"):
+        day = int(match.group("dot_day"))
+        month = int(match.group("dot_month"))
+        year = int(match.group("dot_year"))
+    else:
+        day = int(match.group("text_day"))
+        # IGNORECASE сворачивает и редкие варианты букв (например, U+1C80–U+1C88),
+        # которые .lower() не приводит к обычной форме, поэтому ключа может не быть.
+        month = MONTHS_RU.get(_normalize_month_token(match.group("text_month")))
+        year = int(match.group("text_year"))
+        if not month:
             return None
 
-    match = RUSSIAN_TEXT_DATE_RE.search(value)
-    if match:
-        day = int(match.group("day"))
-        month_name = _normalize_month_token(match.group("month"))
-        month = MONTHS_RU.get(month_name)
-        year = int(match.group("year"))
-        if month:
-            try:
-                return datetime(year, month, day).strftime("%Y-%m-%d")
-            except ValueError:
-                return None
-    return None
+    if not _is_valid_date(year, month, day):
+        return None
+    return f"{year:04d}-{month:02d}-{day:02d}"
 
 
-def find_case_nodes(soup: BeautifulSoup) -> List[Tag]:
-    """Находит подходящие контейнеры карточек кейсов по нескольким селекторам."""
-    selectors = [
-        '[data-testid="case-card"]',
-        ".CaseCard",
-        'a[href*="/cases/"]',
-    ]
-    for selector in selectors:
-        nodes = soup.select(selector)
+def _node_text(node: HtmlElement) -> str:
+    """Склеивает весь текст элемента."""
+    return "".join(_TEXT_XP(node))
+
+
+def _node_stripped_text(node: HtmlElement) -> str:
+    """Склеивает текстовые фрагменты элемента через пробел, обрезая каждый."""
+    return " ".join(part for part in (text.strip() for text in _TEXT_XP(node)) if part)
+
+
+@lru_cache(maxsize=512)
+def _join_url(base_url: str, href: str) -> str:
+    """Превращает ссылку в абсолютную; base_url на странице один, поэтому кэшируем."""
+    return urljoin(base_url, href)
+
+
+def parse_document(html: str) -> Optional[HtmlElement]:
+    """Строит lxml-дерево документа; для пустой страницы возвращает None."""
+    try:
+        document = lxml.html.document_fromstring(html.encode("utf-8"), parser=_HTML_PARSER)
+    except etree.ParserError:
+        return None
+    # Скрипты и стили часто составляют большую часть страницы: убираем их
+    # сразу, чтобы последующие XPath-запросы обходили только полезные узлы.
+    etree.strip_elements(document, *_SKIPPED_TAGS, with_tail=False)
+    return document
+
+
+class _CaseSchema(NamedTuple):
+    """Какие варианты селекторов сработали на странице сайта."""
+
+    card_branch: int
+    title_branch: Optional[int]
+
+
+# Выученные схемы карточек по хосту: после первой страницы сайта следующие
+# разбираются сразу нужным селектором, а общий перебор остаётся запасным путём.
+_CASE_SCHEMAS: dict[str, _CaseSchema] = {}
+
+
+def _match_case_nodes(document: HtmlElement) -> Tuple[Optional[int], List[HtmlElement]]:
+    """Находит карточки и возвращает их вместе с номером сработавшего селектора."""
+    candidates = _CARDS_XP(document)
+    for branch, matcher in enumerate(_CARD_MATCHERS):
+        nodes = [node for node in candidates if matcher(node)]
         if nodes:
-            return nodes
-    return []
+            return branch, nodes
+    return None, []
 
 
-def extract_title(container: Tag, link: Tag) -> Optional[str]:
-    """Пытается достать заголовок кейса из разных мест карточки."""
-    selectors = [
-        '[data-testid="case-card-title"]',
-        '[itemprop="headline"]',
-        '[itemprop="name"]',
-        '[class*="case-card_title"]',
-        '[class*="CaseCard__title"]',
-        ".CaseCard__title",
-        ".vkuiHeadline",
-        "h1",
-        "h3",
-        "h2",
-    ]
-    for selector in selectors:
-        candidate = container.select_one(selector)
-        if candidate:
-            title = _normalize_title_text(candidate.get_text(" ", strip=True))
+def find_case_nodes(document: HtmlElement) -> List[HtmlElement]:
+    """Находит подходящие контейнеры карточек кейсов по нескольким селекторам."""
+    return _match_case_nodes(document)[1]
+
+
+def _candidate_title(node: HtmlElement, cache: dict[HtmlElement, Optional[str]]) -> Optional[str]:
+    """Возвращает заголовок из текста узла, вычисляя его не больше одного раза."""
+    if node not in cache:
+        cache[node] = _normalize_title_text(_node_stripped_text(node))
+    return cache[node]
+
+
+def _match_title(container: HtmlElement, link: HtmlElement) -> Tuple[Optional[int], Optional[str]]:
+    """Ищет заголовок и возвращает номер селектора, если сработал один из TITLE_PREDICATES."""
+    # Один и тот же узел (например, <h3>) проверяется несколькими селекторами
+    # и запасным поиском, поэтому его текст кэшируется в рамках вызова.
+    texts: dict[HtmlElement, Optional[str]] = {}
+    candidates = _TITLE_XP(container)
+    for branch, matcher in enumerate(_TITLE_MATCHERS):
+        candidate = next((node for node in candidates if matcher(node)), None)
+        if candidate is not None:
+            title = _candidate_title(candidate, texts)
             if title:
-                return title
+                return branch, title
 
     for attr in ("title", "aria-label", "aria-labelledby", "data-title"):
-        title = _normalize_title_text(_first_string(link.get(attr)))
+        title = _normalize_title_text(link.get(attr))
         if title:
-            return title
+            return None, title
 
-    for candidate in container.find_all(True):
-        if candidate.name == "button" or candidate.find_parent("button"):
-            continue
-        role = (_first_string(candidate.get("role")) or "").lower()
-        if role == "button":
-            continue
-        class_tokens = " ".join(_iter_strings(candidate.get("class"))).lower()
-        data_test_id = (_first_string(candidate.get("data-testid")) or "").lower()
-        if (
-            candidate.name in {"h1", "h2", "h3", "h4"}
-            or "title" in class_tokens
-            or "headline" in class_tokens
-            or "title" in data_test_id
-        ):
-            title = _normalize_title_text(candidate.get_text(" ", strip=True))
-            if title:
-                return title
+    for candidate in _TITLE_FALLBACK_XP(container):
+        title = _candidate_title(candidate, texts)
+        if title:
+            return None, title
 
-    return None
+    return None, None
+
+
+def extract_title(container: HtmlElement, link: HtmlElement) -> Optional[str]:
+    """Пытается достать заголовок кейса из разных мест карточки."""
+    return _match_title(container, link)[1]
 
 
-def iter_date_texts(container: Tag) -> Iterable[str]:
-    """Генерирует все текстовые кандидаты на дату публикации из карточки."""
-    for time_tag in container.find_all("time"):
-        for datetime_attr in _iter_strings(time_tag.get("datetime")):
-            stripped = _clean_text(datetime_attr)
-            if stripped:
-                yield stripped
-        text = _clean_text(time_tag.get_text())
-        if text:
-            yield text
-    for tag in container.find_all(True):
-        attrs = " ".join(_iter_strings(tag.get("class"))).lower()
-        data_test_id = (_first_string(tag.get("data-testid")) or "").lower()
-        if "date" in attrs or "date" in data_test_id:
-            text = _clean_text(tag.get_text())
-            if text:
-                yield text
-
-
-def extract_date(container: Tag) -> Optional[str]:
+def extract_date(container: HtmlElement) -> Optional[str]:
     """Возвращает нормализованную дату публикации, если она найдена."""
-    for value in iter_date_texts(container):
-        normalized = normalize_date(value)
+    # Сначала <time> (атрибут datetime, затем текст): на современных страницах
+    # дата почти всегда там, и до поиска по class/data-testid дело не доходит.
+    # iterdescendants("time") фильтрует теги в C и лениво останавливается
+    # на первой подходящей дате, не собирая список всех <time>.
+    for time_tag in container.iterdescendants("time"):
+        normalized = normalize_date(time_tag.get("datetime")) or normalize_date(_node_text(time_tag))
+        if normalized:
+            return normalized
+    for node in _DATE_ATTR_XP(container):
+        normalized = normalize_date(_node_text(node))
         if normalized:
             return normalized
     return None
 
 
-def extract_cases(html: str, base_url: str = DEFAULT_BASE_URL) -> List[dict]:
-    """Разбирает HTML-страницу и возвращает список словарей с данными кейсов."""
-    soup = BeautifulSoup(html, "html.parser")
+def extract_cases(
+    html: str,
+    base_url: str = DEFAULT_BASE_URL,
+    *,
+    reuse_schema: bool = False,
+) -> List[dict]:
+    """Разбирает HTML-страницу и возвращает список словарей с данными кейсов.
+
+    С reuse_schema=True запоминает, какие селекторы карточки и заголовка
+    сработали для хоста base_url, и на следующих страницах того же сайта
+    сначала пробует только их. Это рассчитано на однородный шаблон страниц:
+    если выученный селектор ничего не нашёл, используется общий перебор.
+    """
+    if not reuse_schema:
+        return _extract_cases_with_schema(html, base_url, None)[0]
+    host = urlparse(base_url).netloc
+    results, learned = _extract_cases_with_schema(html, base_url, _CASE_SCHEMAS.get(host))
+    if learned is not None:
+        _CASE_SCHEMAS[host] = learned
+    return results
+
+
+def _extract_cases_with_schema(
+    html: str,
+    base_url: str,
+    schema: Optional[_CaseSchema],
+) -> Tuple[List[dict], Optional[_CaseSchema]]:
+    """Разбирает страницу с заданной схемой; возвращает кейсы и новую схему, если её выучили."""
+    document = parse_document(html)
+    if document is None:
+        return [], None
     results = []
     seen_links = set()  # Не допускаем дубликаты ссылок
-
-    for node in find_case_nodes(soup):
-        if node.name == "a" and _first_string(node.get("href")):
-            link_tag: Optional[Tag] = node
+    seen_hrefs = set()  # Повтор исходного href отсекается ещё до urljoin
+
+    nodes = _CARD_BRANCH_XPS[schema.card_branch](document) if schema else []
+    if schema is not None and nodes:
+        card_branch: Optional[int] = schema.card_branch
+        title_branch = schema.title_branch
+    else:
+        schema = None
+        card_branch, nodes = _match_case_nodes(document)
+        title_branch = None
+
+    for node in nodes:
+        if node.tag == "a" and node.get("href"):
+            link_tag: Optional[HtmlElement] = node
         else:
-            link_tag = node.find("a", href=True)
-        if not link_tag:
+            link_tag = node.find(".//a[@href]")
+        if link_tag is None:
             continue
 
-        href = _first_string(link_tag.get("href"))
-        if not href:
+        href = link_tag.get("href")
+        if not href or href in seen_hrefs:
             continue
 
-        absolute_url = urljoin(base_url, href)
+        absolute_url = _join_url(base_url, href)
         if absolute_url in seen_links:
             continue
 
-        title = extract_title(node, link_tag)
+        title = None
+        if schema and schema.title_branch is not None:
+            for candidate in _TITLE_BRANCH_XPS[schema.title_branch](node):
+                title = _normalize_title_text(_node_stripped_text(candidate))
+        if not title:
+            branch, title = _match_title(node, link_tag)
+            if title_branch is None:
+                title_branch = branch
         if not title:
             continue
 
@@ -329,20 +485,72 @@ def extract_cases(html: str, base_url: str = DEFAULT_BASE_URL) -> List[dict]:
             }
         )
         seen_links.add(absolute_url)
+        seen_hrefs.add(href)
+
+    if schema is None and card_branch is not None:
+        return results, _CaseSchema(card_branch, title_branch)
+    return results, None
 
-    return results
 
+def _extract_page(html: str, base_url: str, schema: Optional[_CaseSchema]) -> List[dict]:
+    """Разбирает одну страницу пакета с явно переданной схемой (без общего кэша)."""
+    return _extract_cases_with_schema(html, base_url, schema)[0]
 
-def persist_json_payload(payload: str, output_path: Path, *, echo: bool) -> None:
+
+def extract_cases_batch(
+    htmls: Sequence[str],
+    base_url: str = DEFAULT_BASE_URL,
+    *,
+    max_workers: Optional[int] = None,
+    reuse_schema: bool = False,
+) -> List[List[dict]]:
+    """Разбирает несколько HTML-страниц параллельно в пуле процессов.
+
+    Результаты возвращаются в порядке входных страниц. Каждый процесс один раз
+    импортирует модуль и дальше переиспользует скомпилированные XPath-запросы.
+    С reuse_schema=True схема выучивается в вызывающем процессе по первой
+    странице и явно передаётся во все остальные, поэтому результат не зависит
+    от того, какой процесс разобрал страницу.
+
+    На платформах, где пул запускает процессы через spawn (Windows, macOS),
+    вызов должен находиться под защитой ``if __name__ == "__main__":``.
+    """
+    if not htmls:
+        return []
+    schema: Optional[_CaseSchema] = None
+    first_results: List[List[dict]] = []
+    pending = htmls
+    if reuse_schema:
+        first_results.append(extract_cases(htmls[0], base_url, reuse_schema=True))
+        schema = _CASE_SCHEMAS.get(urlparse(base_url).netloc)
+        pending = htmls[1:]
+
+    extract = partial(_extract_page, base_url=base_url, schema=schema)
+    if max_workers == 1 or len(pending) < 2:
+        return first_results + [extract(html) for html in pending]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return first_results + list(executor.map(extract, pending))
+
+
+def persist_json_payload(payload: str | bytes, output_path: Path, *, echo: bool) -> None:
     """Записывает JSON на диск и при необходимости дублирует его в stdout."""
 
     output_dir = output_path.parent
     if output_dir and not output_dir.exists():
         output_dir.mkdir(parents=True, exist_ok=True)
 
-    output_path.write_text(payload, encoding="utf-8")
+    data = payload.encode("utf-8") if isinstance(payload, str) else payload
+    output_path.write_bytes(data)
     if echo:
-        print(payload)
+        # Готовые UTF-8 байты пишем в буфер stdout без повторного кодирования;
+        # подменённый текстовый stdout (например, StringIO) буфера не имеет.
+        stdout_buffer = getattr(sys.stdout, "buffer", None)
+        if stdout_buffer is None:
+            sys.stdout.write(data.decode("utf-8") + "\n")
+            return
+        sys.stdout.flush()
+        stdout_buffer.write(data + b"\n")
+        stdout_buffer.flush()
 
 
 def parse_args() -> argparse.Namespace:
@@ -390,7 +598,7 @@ def main() -> None:
     html, source_url = load_html_source(args.input, args.url, args.timeout)
     base_url = args.base_url or derive_base_url(source_url) or DEFAULT_BASE_URL
     cases = extract_cases(html, base_url=base_url)
-    payload = json.dumps(cases, ensure_ascii=False, indent=2)
+    payload = orjson.dumps(cases, option=orjson.OPT_INDENT_2)
 
     output_path = args.output or DEFAULT_OUTPUT_PATH
     persist_json_payload(payload, output_path, echo=args.output is None)
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import contextlib
+import io
 import json
 import sys
 from pathlib import Path
@@ -8,10 +10,12 @@ import pytest
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
+import parse_cases
 from parse_cases import (
     DEFAULT_OUTPUT_PATH,
     derive_base_url,
     extract_cases,
+    extract_cases_batch,
     fetch_html_from_url,
     load_html_source,
     normalize_date,
@@ -43,6 +47,44 @@ def test_normalize_date_slash():
     assert normalize_date("01/06/2022") == "2022-06-01"
 
 
+def test_normalize_date_invalid_values():
+    assert normalize_date("31.02.2024") is None
+    assert normalize_date("5 брюмера 2024") is None
+    assert normalize_date("без даты") is None
+
+
+def test_normalize_date_leap_years():
+    assert normalize_date("29.02.2024") == "2024-02-29"
+    assert normalize_date("29 февраля 2000") == "2000-02-29"
+    assert normalize_date("29 февраля 1900") is None
+    assert normalize_date("29.02.2023") is None
+
+
+def test_normalize_date_unicode_spaces():
+    assert normalize_date("21\u202fсентября\u202f2024") == "2024-09-21"
+    assert normalize_date("3\u2009мая\u00a02021 г.") == "2021-05-03"
+
+
+def test_normalize_date_text_inside_sentence():
+    assert normalize_date("Опубликовано 3 мая 2021") == "2021-05-03"
+
+
+def test_normalize_date_skips_words_that_are_not_months():
+    assert normalize_date("5 брюмера 2024, обновлено 6 мая 2020") == "2020-05-06"
+
+
+def test_normalize_date_case_folded_month_variant_is_ignored():
+    assert normalize_date("1 а\u1c80густа 2024") is None
+    html = """
+    <div data-testid="case-card">
+        <a href="/cases/x"><h3>Кейс</h3></a>
+        <span class="date">1 а\u1c80густа 2024</span>
+    </div>
+    """
+    cases = extract_cases(html)
+    assert [case["published_at"] for case in cases] == [None]
+
+
 def test_extract_cases_minimal_html():
     html = """
     <div data-testid="case-card">
@@ -62,6 +104,139 @@ def test_extract_cases_minimal_html():
     json.dumps(cases)
 
 
+def test_extract_cases_respects_selector_priority():
+    html = """
+    <nav><a href="/cases/all">Все кейсы</a></nav>
+    <div data-testid="case-card">
+        <h3>Подзаголовок</h3>
+        <a href="/cases/priority" data-testid="case-card-title">Главный заголовок</a>
+    </div>
+    """
+
+    cases = extract_cases(html)
+    assert [case["url"] for case in cases] == ["https://ads.vk.com/cases/priority"]
+    assert cases[0]["title"] == "Главный заголовок"
+
+
+def test_extract_cases_prefers_time_over_date_classes():
+    html = """
+    <div data-testid="case-card">
+        <span class="CaseCard__Date">1 января 2020</span>
+        <a href="/cases/dated"><h3>Кейс с датами</h3></a>
+        <time datetime="2024-09-21"></time>
+    </div>
+    <div data-testid="case-card">
+        <a href="/cases/class-date"><h3>Кейс без time</h3></a>
+        <span data-testid="case-date">12.03.2023</span>
+    </div>
+    """
+
+    cases = extract_cases(html)
+    assert [case["published_at"] for case in cases] == ["2024-09-21", "2023-03-12"]
+
+
+def test_extract_cases_resolves_links_against_base_url():
+    html = """
+    <div data-testid="case-card"><a href="../cases/relative"><h3>Относительный</h3></a></div>
+    <div data-testid="case-card"><a href="https://other.example/cases/abs"><h3>Абсолютный</h3></a></div>
+    """
+
+    cases = extract_cases(html, base_url="https://example.com/ru/")
+    assert [case["url"] for case in cases] == [
+        "https://example.com/cases/relative",
+        "https://other.example/cases/abs",
+    ]
+
+
+def test_extract_cases_deduplicates_links():
+    html = """
+    <div data-testid="case-card"><a href="/cases/dup"><h3>Без даты</h3></a></div>
+    <div data-testid="case-card"><a href="/cases/dup"><h3>Повтор</h3></a></div>
+    <div data-testid="case-card"><a href="https://ads.vk.com/cases/dup"><h3>Абсолютный повтор</h3></a></div>
+    <div data-testid="case-card"><a href="/cases/untitled"></a></div>
+    <div data-testid="case-card"><a href="/cases/untitled"><h3>Второй шанс</h3></a></div>
+    """
+
+    cases = extract_cases(html)
+    assert [(case["title"], case["url"]) for case in cases] == [
+        ("Без даты", "https://ads.vk.com/cases/dup"),
+        ("Второй шанс", "https://ads.vk.com/cases/untitled"),
+    ]
+
+
+def test_extract_cases_ignores_scripts_and_styles():
+    html = """
+    <html><head><style>.CaseCard { color: red }</style></head><body>
+    <script>document.write('<a href="/cases/fake">Фейк</a>')</script>
+    <div data-testid="case-card">
+        <a href="/cases/real"><h3>Настоящий <script>track()</script>кейс</h3></a>
+    </div>
+    </body></html>
+    """
+
+    cases = extract_cases(html)
+    assert [(case["title"], case["url"]) for case in cases] == [
+        ("Настоящий кейс", "https://ads.vk.com/cases/real"),
+    ]
+
+
+def test_extract_cases_empty_document():
+    assert extract_cases("") == []
+    assert extract_cases('<?xml version="1.0" encoding="utf-8"?><html></html>') == []
+
+
+def test_extract_cases_reuses_learned_schema_per_host(monkeypatch):
+    monkeypatch.setattr("parse_cases._CASE_SCHEMAS", {})
+    first_page = """
+    <div class="CaseCard"><a href="/cases/one"><span class="CaseCard__title">Первый</span></a></div>
+    """
+    second_page = """
+    <div class="CaseCard"><a href="/cases/two"><span class="CaseCard__title">Второй</span></a>
+        <time datetime="2024-05-01"></time></div>
+    <div class="CaseCard"><a href="/cases/three"><h2>Третий</h2></a></div>
+    """
+
+    assert extract_cases(first_page, reuse_schema=True)[0]["title"] == "Первый"
+    assert parse_cases._CASE_SCHEMAS["ads.vk.com"] == (1, 4)
+
+    cases = extract_cases(second_page, reuse_schema=True)
+    assert [(case["title"], case["published_at"]) for case in cases] == [
+        ("Второй", "2024-05-01"),
+        ("Третий", None),
+    ]
+
+
+def test_extract_cases_batch_keeps_page_order():
+    pages = [
+        f'<div data-testid="case-card"><a href="/cases/{slug}"><h3>{slug}</h3></a></div>'
+        for slug in ("first", "second", "third")
+    ]
+    pages.append("")
+
+    expected = [extract_cases(page) for page in pages]
+    assert extract_cases_batch(pages, max_workers=2) == expected
+    assert extract_cases_batch(pages, max_workers=1) == expected
+    assert extract_cases_batch([]) == []
+
+
+def test_extract_cases_batch_reuse_schema_matches_inline(monkeypatch):
+    monkeypatch.setattr("parse_cases._CASE_SCHEMAS", {})
+    learning_page = """
+    <div data-testid="case-card"><a href="/cases/a"><div data-testid="case-card-title">А</div></a></div>
+    """
+    mixed_page = """
+    <div data-testid="case-card"><h3>Подзаголовок</h3>
+        <a href="/cases/b"><div data-testid="case-card-title">Б</div></a></div>
+    """
+    pages = [learning_page, mixed_page, mixed_page, learning_page]
+
+    pooled = extract_cases_batch(pages, max_workers=2, reuse_schema=True)
+    monkeypatch.setattr("parse_cases._CASE_SCHEMAS", {})
+    inline = extract_cases_batch(pages, max_workers=1, reuse_schema=True)
+    assert pooled == inline
+    assert [case["title"] for page in pooled for case in page] == ["А", "Б", "Б", "А"]
+
+
 def test_derive_base_url_from_full_url():
     assert derive_base_url("https://ads.vk.com/cases/example") == "https://ads.vk.com"
     assert derive_base_url("not-a-url") is None
@@ -86,7 +261,7 @@ def test_fetch_html_from_url(monkeypatch):
         captured["headers"] = headers
         return DummyResponse()
 
-    monkeypatch.setattr("parse_cases.requests.get", fake_get)
+    monkeypatch.setattr("parse_cases._SESSION.get", fake_get)
     html = fetch_html_from_url("https://example.com/cases", timeout=3.5)
     assert html == "<html></html>"
     assert captured["url"] == "https://example.com/cases"
@@ -153,6 +328,27 @@ def test_persist_json_payload_writes_to_disk_and_prints(tmp_path, capsys):
     assert captured.out.strip() == payload
 
 
+def test_persist_json_payload_accepts_utf8_bytes(tmp_path, capsys):
+    payload = '[{"title": "Кейс"}]'
+    output_path = tmp_path / "results.json"
+    persist_json_payload(payload.encode("utf-8"), output_path, echo=True)
+
+    assert output_path.read_text(encoding="utf-8") == payload
+    captured = capsys.readouterr()
+    assert captured.out.strip() == payload
+
+
+def test_persist_json_payload_echoes_to_text_only_stdout(tmp_path):
+    payload = '[{"title": "Кейс"}]'
+    output_path = tmp_path / "results.json"
+    stream = io.StringIO()
+    with contextlib.redirect_stdout(stream):
+        persist_json_payload(payload.encode("utf-8"), output_path, echo=True)
+
+    assert output_path.read_text(encoding="utf-8") == payload
+    assert stream.getvalue() == payload + "\n"
+
+
 def test_persist_json_payload_creates_parent_dirs(tmp_path, capsys):
     payload = '{"title": "Nested"}'
     nested_path = tmp_path / "exports" / "cases.json"